@@ -1,50 +1,40 @@
 import os
 import logging
-from flask import Flask
-from flask_login import LoginManager
+from flask import Flask, render_template, redirect, url_for, current_app
+from flask_login import LoginManager, current_user, login_required
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.middleware.proxy_fix import ProxyFix
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+from models import get_user_by_id
 
-# Create the app
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
-
-# Configure upload folder
-app.config['UPLOAD_FOLDER'] = os.path.join('static', 'uploads')
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Settings per deployment profile, picked with ZEROHUNGER_PROFILE
+PROFILES = {
+    'development': {
+        'DEBUG': True,
+        'LOG_LEVEL': logging.DEBUG,
+        'TEMPLATES_AUTO_RELOAD': True,
+        'PRECOMPILE_TEMPLATES': False,
+        'JINJA_BYTECODE_CACHE': False,
+    },
+    'production': {
+        'DEBUG': False,
+        'LOG_LEVEL': logging.INFO,
+        'TEMPLATES_AUTO_RELOAD': False,
+        'PRECOMPILE_TEMPLATES': True,
+        'JINJA_BYTECODE_CACHE': True,
+    },
+}
 
 # Initialize Flask-Login
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 login_manager.login_message = 'Please log in to access this page.'
 
-# Import models and create in-memory storage
-from models import users, foods, requests as food_requests, get_user_by_id
-
 @login_manager.user_loader
 def load_user(user_id):
     return get_user_by_id(user_id)
 
-# Register blueprints
-from auth import auth_bp
-from provider import provider_bp
-from receiver import receiver_bp
-from delivery import delivery_bp
-
-app.register_blueprint(auth_bp, url_prefix='/auth')
-app.register_blueprint(provider_bp, url_prefix='/provider')
-app.register_blueprint(receiver_bp, url_prefix='/receiver')
-app.register_blueprint(delivery_bp, url_prefix='/delivery')
-
 # Main routes
-from flask import render_template, redirect, url_for
-from flask_login import current_user, login_required
-
-@app.route('/')
 def index():
     if current_user.is_authenticated:
         if current_user.current_role == 'provider':
@@ -53,23 +43,91 @@ def index():
             return redirect(url_for('receiver.dashboard'))
     return render_template('index.html')
 
-@app.route('/switch_role/<role>')
 @login_required
 def switch_role(role):
     if role in ['provider', 'receiver', 'delivery_person']:
         current_user.current_role = role
-        app.logger.info(f"User {current_user.username} switched to role: {role}")
-        
+        current_app.logger.info(f"User {current_user.username} switched to role: {role}")
+
         if role == 'provider':
             return redirect(url_for('provider.dashboard'))
         elif role == 'delivery_person':
             return redirect(url_for('delivery.dashboard'))
         else:
             return redirect(url_for('receiver.dashboard'))
-    
+
     return redirect(url_for('index'))
 
+def precompile_templates(app):
+    # Compile every template once so the first request doesn't pay for it;
+    # with a bytecode cache the compiled code is also reused across restarts.
+    # Only the app loader's names: blueprint folders expose the same files again
+    # under bare names ('dashboard.html') that views never ask for.
+    for name in app.jinja_loader.list_templates():
+        if name.endswith('.html'):
+            app.jinja_env.get_template(name)
+
+def create_app(profile=None):
+    profile = profile or os.environ.get('ZEROHUNGER_PROFILE', 'development')
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile}")
+    settings = PROFILES[profile]
+
+    # Configure logging
+    logging.basicConfig(level=settings['LOG_LEVEL'])
+
+    # Create the app
+    app = Flask(__name__)
+    app.config.update(settings, PROFILE=profile)
+    app.secret_key = os.environ.get("SESSION_SECRET")
+    if not app.secret_key:
+        if profile == 'production':
+            raise RuntimeError("SESSION_SECRET must be set for the production profile")
+        app.secret_key = "dev-secret-key-change-in-production"
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+
+    # Configure upload folder
+    app.config['UPLOAD_FOLDER'] = os.path.join('static', 'uploads')
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+
+    if settings['JINJA_BYTECODE_CACHE']:
+        # Jinja's default location is a per-user temp directory that it checks
+        # for ownership and permissions before loading any cached code
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+    login_manager.init_app(app)
+
+    # Register blueprints
+    from auth import auth_bp
+    from provider import provider_bp
+    from receiver import receiver_bp
+    from delivery import delivery_bp
+
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(provider_bp, url_prefix='/provider')
+    app.register_blueprint(receiver_bp, url_prefix='/receiver')
+    app.register_blueprint(delivery_bp, url_prefix='/delivery')
+
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/switch_role/<role>', 'switch_role', switch_role)
+
+    if settings['PRECOMPILE_TEMPLATES']:
+        # Under gunicorn's preload_app this runs once in the master and the
+        # compiled templates are shared with every forked worker
+        precompile_templates(app)
+
+    return app
+
+def __getattr__(name):
+    # `from app import app` still works, but importing the factory alone
+    # (e.g. gunicorn 'app:create_app("production")') doesn't build a second app
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
+    app = create_app()
     # Ensure upload directory exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=app.debug, use_reloader=app.debug)
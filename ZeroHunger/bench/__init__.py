@@ -0,0 +1,2 @@
+# Local benchmark harness for Zero Hunger.
+# Run from the ZeroHunger directory: python -m bench.run --help
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import random
+import time
+
+import models
+from bench.seed import BENCH_PASSWORD, CATEGORY_WEIGHTS, TITLES, location_pool, reset_storage
+
+
+def make_rows(n_rows, seed=0):
+    rng = random.Random(seed)
+    locations, location_weights = location_pool(seed=seed)
+    categories = list(CATEGORY_WEIGHTS)
+    weights = list(CATEGORY_WEIGHTS.values())
+    # One donor posting after an event: a single pickup point for the whole batch
+    location = rng.choices(locations, location_weights)[0]
+    rows = []
+    for _ in range(n_rows):
+        category = rng.choices(categories, weights)[0]
+        rows.append({'title': rng.choice(TITLES[category]),
+                     'description': f'{rng.randint(5, 80)} servings from the banquet',
+                     'category': category,
+                     'expiry_hours': str(rng.choice([4, 6, 12])),
+                     'location': location})
+    return rows
+
+
+def to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def to_jsonl(rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows).encode()
+
+
+def _provider_client(app):
+    reset_storage()
+    models.create_user('bench_donor', 'bench_donor@example.com', BENCH_PASSWORD)
+    client = app.test_client()
+    client.post('/auth/login', data={'username': 'bench_donor', 'password': BENCH_PASSWORD})
+    client.get('/switch_role/provider')
+    return client
+
+
+def run_ingest(recorder, app, n_rows=10_000, single_rows=500, seed=0):
+    """Compare rows/sec of the bulk endpoint against one form post per item.
+
+    The single-item path follows the redirect so each row also pays for the
+    dashboard re-render a donor sees. It runs on ``single_rows`` items only,
+    since its cost grows with the donor's catalogue.
+    """
+    rows = make_rows(n_rows, seed)
+    results = {}
+    recorder.start()
+
+    client = _provider_client(app)
+    start = time.perf_counter()
+    for row in rows[:single_rows]:
+        row_start = time.perf_counter()
+        response = client.post('/provider/upload', data=row, follow_redirects=True)
+        recorder.record_label('ingest single upload + dashboard (per row)',
+                              time.perf_counter() - row_start)
+        if response.status_code != 200:
+            raise RuntimeError(f'single upload returned {response.status_code}')
+    results['single'] = single_rows / (time.perf_counter() - start)
+
+    for fmt, body, content_type in (('csv', to_csv(rows), 'text/csv'),
+                                    ('jsonl', to_jsonl(rows), 'application/x-ndjson')):
+        client = _provider_client(app)
+        start = time.perf_counter()
+        response = client.post('/provider/upload/bulk', data=body, content_type=content_type)
+        elapsed = time.perf_counter() - start
+        recorder.record_label(f'ingest bulk {fmt}', elapsed)
+        if response.status_code != 200 or response.json['created'] != n_rows:
+            raise RuntimeError(f'bulk {fmt} upload failed: {response.status_code}')
+        results[fmt] = n_rows / elapsed
+
+    recorder.stop()
+    return results
@@ -0,0 +1,131 @@
+import random
+import time
+
+import models
+from bench.seed import BENCH_PASSWORD, TITLES
+
+
+class TimedClient:
+    """Flask test client wrapper that records each call's latency by route."""
+
+    def __init__(self, app, recorder):
+        self.client = app.test_client()
+        self.recorder = recorder
+
+    def request(self, method, path, data=None, expect=(200, 302)):
+        start = time.perf_counter()
+        response = self.client.open(path, method=method, data=data)
+        self.recorder.record(method, path, time.perf_counter() - start)
+        if response.status_code not in expect:
+            raise RuntimeError(f'{method} {path} returned {response.status_code}')
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, data, **kwargs):
+        return self.request('POST', path, data=data, **kwargs)
+
+
+def _find_request(food_id, receiver_id):
+    for food_request in models.requests.values():
+        if food_request.food_id == food_id and food_request.receiver_id == receiver_id:
+            return food_request
+    return None
+
+
+def _find_assignment(request_id):
+    for assignment in models.delivery_assignments.values():
+        if assignment.request_id == request_id:
+            return assignment
+    return None
+
+
+class JourneyRunner:
+    """Drives provider -> receiver -> courier journeys against one app instance.
+
+    Every iteration uploads a dish as a provider, has a receiver browse and
+    request it, then has a courier accept the request and complete both OTP
+    checks. One logged-in client is kept per user, the way a browser would.
+    """
+
+    def __init__(self, app, recorder, dataset, seed=0):
+        self.app = app
+        self.recorder = recorder
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.clients = {}
+
+    def client_for(self, user, role):
+        client = self.clients.get(user.id)
+        if client is None:
+            client = TimedClient(self.app, self.recorder)
+            client.post('/auth/login', {'username': user.username, 'password': BENCH_PASSWORD},
+                        expect=(302,))
+            self.clients[user.id] = client
+        if user.current_role != role:
+            client.get(f'/switch_role/{role}', expect=(302,))
+        return client
+
+    def pick_location(self):
+        return self.rng.choices(self.dataset['locations'], self.dataset['location_weights'])[0]
+
+    def pick_category(self):
+        return self.rng.choices(self.dataset['categories'], self.dataset['category_weights'])[0]
+
+    def provider_journey(self, provider):
+        client = self.client_for(provider, 'provider')
+        client.get('/provider/upload')
+        category = self.pick_category()
+        title = f'{self.rng.choice(TITLES[category])} #{self.rng.randint(1, 10 ** 9)}'
+        client.post('/provider/upload', {
+            'title': title,
+            'description': 'Leftover from tonight\'s event',
+            'category': category,
+            'expiry_hours': str(self.rng.choice([4, 6, 12])),
+            'location': self.pick_location(),
+        }, expect=(302,))
+        client.get('/provider/dashboard')
+        # Titles carry a random suffix, so the newest match is the one just uploaded
+        for food in reversed(list(models.foods.values())):
+            if food.title == title:
+                return food
+        raise RuntimeError('uploaded food not found')
+
+    def receiver_journey(self, receiver, food):
+        client = self.client_for(receiver, 'receiver')
+        client.get('/receiver/dashboard')
+        client.get(f'/receiver/browse?location={food.location}')
+        client.get(f'/receiver/browse?category={self.pick_category()}')
+        client.get(f'/receiver/request/{food.id}')
+        client.post(f'/receiver/request/{food.id}', {'message': 'For our evening shelter meal'},
+                    expect=(302,))
+        food_request = _find_request(food.id, receiver.id)
+        if food_request is None:
+            raise RuntimeError('food request was not created')
+        return food_request
+
+    def courier_journey(self, courier, food_request):
+        client = self.client_for(courier, 'delivery_person')
+        client.get('/delivery/available_requests')
+        client.get(f'/delivery/accept_request/{food_request.id}', expect=(302,))
+        assignment = _find_assignment(food_request.id)
+        if assignment is None:
+            raise RuntimeError('delivery assignment was not created')
+        client.get(f'/delivery/verify_pickup/{assignment.id}')
+        client.post(f'/delivery/verify_pickup/{assignment.id}',
+                    {'otp_code': assignment.pickup_otp}, expect=(302,))
+        client.post(f'/delivery/verify_delivery/{assignment.id}',
+                    {'otp_code': assignment.delivery_otp}, expect=(302,))
+        client.get('/delivery/dashboard')
+        if assignment.status != 'delivered':
+            raise RuntimeError(f'assignment {assignment.id} ended in {assignment.status}')
+
+    def run(self, iterations):
+        users = self.dataset['users']
+        self.recorder.start()
+        for _ in range(iterations):
+            food = self.provider_journey(self.rng.choice(users['provider']))
+            food_request = self.receiver_journey(self.rng.choice(users['receiver']), food)
+            self.courier_journey(self.rng.choice(users['delivery_person']), food_request)
+        self.recorder.stop()
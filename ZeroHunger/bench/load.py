@@ -0,0 +1,140 @@
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+from bench.seed import BENCH_PASSWORD, CATEGORY_WEIGHTS, location_pool
+
+ROLE_NAMES = ['provider', 'receiver', 'delivery_person']
+BENCH_SESSION_SECRET = 'bench-only-session-secret'
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Time each route on its own instead of following redirects to the dashboard
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start listening on port {port}')
+
+
+def start_gunicorn(workers, port, dataset_env):
+    env = dict(os.environ, **{key: str(value) for key, value in dataset_env.items()})
+    # gunicorn.conf.py selects the production profile, which needs a session secret
+    env.setdefault('SESSION_SECRET', BENCH_SESSION_SECRET)
+    command = [sys.executable, '-m', 'gunicorn', '--preload', '-w', str(workers),
+               '-b', f'127.0.0.1:{port}', '--log-level', 'warning', 'bench.wsgi:app']
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env)
+    try:
+        _wait_for_port(port)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process
+
+
+class HttpUser:
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), _NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        self.recorder.record(method, path, time.perf_counter() - start)
+        if status not in (200, 302):
+            raise RuntimeError(f'{method} {path} returned {status}')
+
+
+def _user_loop(base_url, recorder, index, role, requests_per_user, seed):
+    rng = random.Random(seed * 7919 + index)
+    locations, location_weights = location_pool(seed=seed)
+    categories = list(CATEGORY_WEIGHTS)
+    category_weights = list(CATEGORY_WEIGHTS.values())
+
+    user = HttpUser(base_url, recorder)
+    user.request('POST', '/auth/login',
+                 {'username': f'bench_user_{index}', 'password': BENCH_PASSWORD})
+
+    # Read-mostly mix: in-memory storage is per worker, so writes made through
+    # one worker would be invisible to the others
+    if role == 'provider':
+        paths = lambda: ['/provider/dashboard']
+    elif role == 'delivery_person':
+        paths = lambda: ['/delivery/available_requests', '/delivery/dashboard']
+    else:
+        paths = lambda: [
+            f'/receiver/browse?location={rng.choices(locations, location_weights)[0]}',
+            f'/receiver/browse?category={rng.choices(categories, category_weights)[0]}',
+            '/receiver/dashboard',
+        ]
+
+    sent = 0
+    while sent < requests_per_user:
+        for path in paths():
+            user.request('GET', path)
+            sent += 1
+
+
+def run_gunicorn_load(recorder, workers=4, concurrency=8, requests_per_user=200,
+                      n_users=300, n_foods=2000, n_requests=600, n_assignments=300, seed=0):
+    """Start a preloaded multi-worker gunicorn and hit it from ``concurrency`` threads."""
+    port = _free_port()
+    process = start_gunicorn(workers, port, {
+        'BENCH_USERS': n_users, 'BENCH_FOODS': n_foods, 'BENCH_REQUESTS': n_requests,
+        'BENCH_ASSIGNMENTS': n_assignments, 'BENCH_SEED': seed,
+    })
+    base_url = f'http://127.0.0.1:{port}'
+    errors = []
+
+    def worker(index):
+        try:
+            _user_loop(base_url, recorder, index, ROLE_NAMES[index % 3], requests_per_user, seed)
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        threads = [threading.Thread(target=worker, args=(i % n_users,)) for i in range(concurrency)]
+        recorder.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.stop()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    if errors:
+        raise errors[0]
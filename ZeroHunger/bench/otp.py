@@ -0,0 +1,81 @@
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+
+from models import OTP
+from otp_service import OTPService, OTP_VERIFIED, OTP_INVALID
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _populate(service, n_deliveries):
+    assignment_ids = [str(uuid.uuid4()) for _ in range(n_deliveries)]
+    for assignment_id in assignment_ids:
+        service.issue(assignment_id, assignment_id, 'pickup')
+    return assignment_ids
+
+
+def measure_memory(n_deliveries):
+    """Bytes held by the OTP table, index and timer wheel per active delivery."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    service = OTPService({}, OTP, clock=FakeClock())
+    assignment_ids = _populate(service, n_deliveries)
+    # The id list is the benchmark's own bookkeeping, not part of the service
+    del assignment_ids
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_deliveries, len(service.store)
+
+
+def run_otp(recorder, n_deliveries=100_000, verifications=100_000, seed=0):
+    """Verification throughput with ``n_deliveries`` active pickup codes.
+
+    Drives a realistic mix: most couriers enter the right pickup code (which
+    issues the delivery code), some mistype first, and a slice of codes is
+    left to expire through the timer wheel.
+    """
+    rng = random.Random(seed)
+    clock = FakeClock()
+    service = OTPService({}, OTP, clock=clock)
+
+    recorder.start()
+    start = time.perf_counter()
+    assignment_ids = _populate(service, n_deliveries)
+    recorder.record_label('otp issue (bulk, per code)', (time.perf_counter() - start) / n_deliveries)
+
+    for i in range(verifications):
+        assignment_id = assignment_ids[i % n_deliveries]
+        if rng.random() < 0.1:
+            start = time.perf_counter()
+            result = service.verify(assignment_id, 'pickup', '------')
+            recorder.record_label('otp verify invalid', time.perf_counter() - start)
+            assert result == OTP_INVALID
+        code = service.active_code(assignment_id, 'pickup')
+        if code is None:
+            continue
+        start = time.perf_counter()
+        result = service.verify(assignment_id, 'pickup', code)
+        recorder.record_label('otp verify valid', time.perf_counter() - start)
+        assert result == OTP_VERIFIED
+        service.issue(assignment_id, assignment_id, 'delivery')
+
+    # Jump past the TTL so every unused delivery code is swept in one go
+    clock.now += service.ttl_seconds + service.wheel.tick_seconds
+    start = time.perf_counter()
+    expired = service.expire_due()
+    recorder.record_label('otp expire sweep (per code)', (time.perf_counter() - start) / max(expired, 1))
+    service.flush_retired()
+    recorder.stop()
+
+    return {'active_after_sweep': len(service.active), 'table_after_sweep': len(service.store),
+            'expired': expired}
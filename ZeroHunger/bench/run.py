@@ -0,0 +1,154 @@
+"""Zero Hunger benchmark runner.
+
+    python -m bench.run                      # test client journeys, compare to baseline
+    python -m bench.run --mode gunicorn -w 4  # multi-worker read-mostly load
+    python -m bench.run --mode startup        # cold start: import time and first request
+    python -m bench.run --mode otp            # OTP verification throughput and memory
+    python -m bench.run --mode ingest         # bulk import rows/sec vs single uploads
+    python -m bench.run --save-baseline       # record this run as the new baseline
+
+Exits with status 1 when a route regresses past the tolerance.
+"""
+import argparse
+import os
+import sys
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark Zero Hunger routes locally.')
+    parser.add_argument('--mode', choices=['client', 'gunicorn', 'startup', 'otp', 'ingest'], default='client')
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--foods', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--assignments', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=200,
+                        help='client mode: number of upload-to-delivery journeys')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                        help='gunicorn mode: worker processes')
+    parser.add_argument('-c', '--concurrency', type=int, default=8,
+                        help='gunicorn mode: concurrent simulated users')
+    parser.add_argument('--requests-per-user', type=int, default=200,
+                        help='gunicorn mode: requests sent by each simulated user')
+    parser.add_argument('--repeats', type=int, default=10,
+                        help='startup mode: number of cold starts')
+    parser.add_argument('--profile', choices=['development', 'production'], default='production',
+                        help='startup mode: app profile to start')
+    parser.add_argument('--deliveries', type=int, default=100_000,
+                        help='otp mode: active deliveries holding a code')
+    parser.add_argument('--rows', type=int, default=10_000,
+                        help='ingest mode: rows per bulk import')
+    parser.add_argument('--single-rows', type=int, default=500,
+                        help='ingest mode: rows posted one at a time for comparison')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed fractional p50/throughput slowdown before failing')
+    parser.add_argument('--p99-tolerance', type=float, default=0.5,
+                        help='allowed fractional p99 slowdown before failing')
+    return parser.parse_args(argv)
+
+
+def run_client(args, recorder, app):
+    from bench.journeys import JourneyRunner
+    from bench.seed import seed_data
+
+    dataset = seed_data(args.users, args.foods, args.requests, args.assignments, args.seed)
+    JourneyRunner(app, recorder, dataset, seed=args.seed).run(args.iterations)
+
+
+def run_gunicorn(args, recorder):
+    from bench.load import run_gunicorn_load
+
+    run_gunicorn_load(recorder, workers=args.workers, concurrency=args.concurrency,
+                      requests_per_user=args.requests_per_user, n_users=args.users,
+                      n_foods=args.foods, n_requests=args.requests,
+                      n_assignments=args.assignments, seed=args.seed)
+
+
+def run_startup(args, recorder):
+    from bench.startup import run_startup as run_cold_starts
+
+    run_cold_starts(recorder, repeats=args.repeats, profile=args.profile)
+
+
+def run_otp(args, recorder):
+    from bench.otp import run_otp as run_otp_load, measure_memory
+
+    bytes_per_delivery, table_size = measure_memory(args.deliveries)
+    print(f'OTP memory: {bytes_per_delivery:.0f} bytes per active delivery '
+          f'({table_size} codes, {bytes_per_delivery * args.deliveries / 2 ** 20:.1f} MiB)')
+    result = run_otp_load(recorder, n_deliveries=args.deliveries,
+                          verifications=args.deliveries, seed=args.seed)
+    print(f"OTP table after expiry sweep: {result['table_after_sweep']} rows, "
+          f"{result['expired']} codes expired")
+
+
+def run_ingest(args, recorder, app):
+    from bench.ingest import run_ingest as run_imports
+
+    rates = run_imports(recorder, app, n_rows=args.rows, single_rows=args.single_rows,
+                        seed=args.seed)
+    for name, rate in rates.items():
+        print(f'ingest {name}: {rate:.0f} rows/s ({rate / rates["single"]:.1f}x single)')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from app import create_app
+    from bench.load import BENCH_SESSION_SECRET
+    from bench.stats import (RouteRecorder, format_summary, compare_to_baseline,
+                             load_baseline, save_baseline)
+
+    # Time the profile gunicorn serves, not the dev server's debug and template reloading
+    os.environ.setdefault('SESSION_SECRET', BENCH_SESSION_SECRET)
+    app = create_app('production')
+
+    recorder = RouteRecorder(app)
+    if args.mode == 'client':
+        run_client(args, recorder, app)
+    elif args.mode == 'gunicorn':
+        run_gunicorn(args, recorder)
+    elif args.mode == 'startup':
+        run_startup(args, recorder)
+    elif args.mode == 'otp':
+        run_otp(args, recorder)
+    else:
+        run_ingest(args, recorder, app)
+
+    summary = recorder.summary()
+    summary['params'] = {key: value for key, value in vars(args).items()
+                         if key not in ('baseline', 'save_baseline', 'tolerance', 'p99_tolerance')}
+    print(format_summary(summary))
+
+    baselines = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+    if args.save_baseline:
+        baselines[args.mode] = summary
+        save_baseline(args.baseline, baselines)
+        print(f'Saved {args.mode} baseline to {args.baseline}')
+        return 0
+
+    baseline = baselines.get(args.mode)
+    if baseline is None:
+        print(f'No {args.mode} baseline in {args.baseline}; run with --save-baseline first.')
+        return 0
+    base_params = baseline.get('params', {})
+    if any(base_params[key] != value for key, value in summary['params'].items() if key in base_params):
+        print('Warning: run parameters differ from the baseline, comparison may be meaningless.')
+
+    regressions = compare_to_baseline(summary, baseline, tolerance=args.tolerance,
+                                      p99_tolerance=args.p99_tolerance)
+    if regressions:
+        print('Regressions against baseline:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print('No regressions against baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
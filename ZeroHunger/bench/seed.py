@@ -0,0 +1,121 @@
+import copy
+import random
+import uuid
+
+import models
+from models import (create_food, request_food, assign_delivery_person, verify_otp,
+                   FOOD_CATEGORIES)
+
+BENCH_PASSWORD = 'benchpass'
+
+# Rough share of donations per category - cooked staples dominate real pickups
+CATEGORY_WEIGHTS = {
+    'Rice': 18, 'Curry': 16, 'Bread': 12, 'Vegetables': 10, 'Snacks': 9,
+    'Fruits': 7, 'Desserts': 7, 'Dairy': 5, 'Meat': 5, 'Beverages': 4,
+    'Seafood': 3, 'Other': 4,
+}
+
+TITLES = {
+    'Rice': ['Veg Biryani', 'Jeera Rice', 'Lemon Rice', 'Fried Rice'],
+    'Curry': ['Dal Tadka', 'Paneer Butter Masala', 'Chana Masala', 'Sambar'],
+    'Bread': ['Chapati', 'Naan', 'Bread Loaves', 'Parotta'],
+    'Vegetables': ['Mixed Veg', 'Aloo Gobi', 'Fresh Tomatoes', 'Cabbage Poriyal'],
+    'Snacks': ['Samosa', 'Vada', 'Sandwiches', 'Pakora'],
+    'Fruits': ['Bananas', 'Apples', 'Fruit Salad', 'Papaya'],
+    'Desserts': ['Gulab Jamun', 'Payasam', 'Cake Slices', 'Halwa'],
+    'Dairy': ['Curd', 'Milk Packets', 'Paneer', 'Buttermilk'],
+    'Meat': ['Chicken Curry', 'Mutton Biryani', 'Chicken Fry', 'Egg Curry'],
+    'Beverages': ['Tea Flask', 'Juice Bottles', 'Lassi', 'Coffee'],
+    'Seafood': ['Fish Curry', 'Prawn Fry', 'Fish Fry', 'Crab Masala'],
+    'Other': ['Assorted Buffet Leftovers', 'Packed Meals', 'Biscuits', 'Noodles'],
+}
+
+
+def location_pool(n_locations=40, seed=0):
+    # Pin codes with Zipf-like weights: a few dense city areas, a long tail of suburbs
+    rng = random.Random(seed)
+    codes = sorted(rng.sample(range(600001, 600999), n_locations))
+    weights = [1.0 / (rank ** 1.1) for rank in range(1, n_locations + 1)]
+    return [str(code) for code in codes], weights
+
+
+def reset_storage():
+    models.users.clear()
+    models.foods.clear()
+    models.requests.clear()
+    models.delivery_assignments.clear()
+    models.otp_service.reset()
+
+
+def _clone_user(template, index):
+    # Hashing a password per user would dominate seeding time, so every bench
+    # user shares the template's hash and only gets a fresh identity
+    user = copy.copy(template)
+    user.id = str(uuid.uuid4())
+    user.username = f'bench_user_{index}'
+    user.email = f'bench_user_{index}@example.com'
+    models.users[user.id] = user
+    return user
+
+
+def seed_data(n_users=300, n_foods=2000, n_requests=600, n_assignments=300, seed=0):
+    """Fill the in-memory store with a reproducible, skewed dataset.
+
+    Users are split evenly between providers, receivers and delivery people.
+    A handful of providers post most of the food, and locations/categories
+    follow the weights above. Returns a dict of the seeded users by role and
+    the location pool so load drivers can build matching queries.
+    """
+    rng = random.Random(seed)
+    reset_storage()
+
+    locations, location_weights = location_pool(seed=seed)
+    categories = list(CATEGORY_WEIGHTS)
+    category_weights = [CATEGORY_WEIGHTS[c] for c in categories]
+    assert set(categories) == set(FOOD_CATEGORIES)
+
+    template = models.create_user('bench_user_0', 'bench_user_0@example.com', BENCH_PASSWORD)
+    all_users = [template] + [_clone_user(template, i) for i in range(1, n_users)]
+
+    roles = {'provider': [], 'receiver': [], 'delivery_person': []}
+    role_names = list(roles)
+    for i, user in enumerate(all_users):
+        user.current_role = role_names[i % 3]
+        roles[user.current_role].append(user)
+
+    # Each user has a home location; large donors are concentrated in busy areas
+    home = {user.id: rng.choices(locations, location_weights)[0] for user in all_users}
+    providers = roles['provider']
+    provider_weights = [1.0 / (rank ** 0.8) for rank in range(1, len(providers) + 1)]
+
+    for _ in range(n_foods):
+        provider = rng.choices(providers, provider_weights)[0]
+        category = rng.choices(categories, category_weights)[0]
+        create_food(rng.choice(TITLES[category]),
+                    f'{rng.randint(5, 80)} servings, packed and ready for pickup',
+                    category, rng.choice([2, 4, 6, 8, 12, 24]),
+                    home[provider.id], provider.id)
+
+    # A random slice of the catalogue gets requested, so busy areas see most requests
+    available = list(models.foods.values())
+    rng.shuffle(available)
+    receivers = roles['receiver']
+    food_requests = []
+    for food in available[:n_requests]:
+        receiver = rng.choice(receivers)
+        food_request = request_food(food.id, receiver.id, 'Requested by benchmark seeder')
+        if food_request:
+            food_requests.append(food_request)
+
+    # Delivery people take a share of the pending requests, some already mid-route
+    couriers = roles['delivery_person']
+    for food_request in food_requests[:n_assignments]:
+        assignment = assign_delivery_person(food_request.id, rng.choice(couriers).id)
+        stage = rng.random()
+        if stage < 0.4:
+            verify_otp(assignment.id, assignment.pickup_otp, 'pickup')
+        if stage < 0.2:
+            verify_otp(assignment.id, assignment.delivery_otp, 'delivery')
+
+    return {'users': roles, 'locations': locations, 'location_weights': location_weights,
+            'categories': categories, 'category_weights': category_weights}
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench.load import BASE_DIR, BENCH_SESSION_SECRET
+
+# Runs in a fresh interpreter so every sample is a true cold start
+PROBE = '''
+import json, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+client = app.test_client()
+client.get('/auth/login')
+t3 = time.perf_counter()
+client.get('/delivery/dashboard')
+t4 = time.perf_counter()
+print(json.dumps({
+    'import app': t1 - t0,
+    'create_app': t2 - t1,
+    'first GET auth.login': t3 - t2,
+    'first GET delivery.dashboard': t4 - t3,
+}))
+'''
+
+
+def run_startup(recorder, repeats=10, profile='production'):
+    """Time interpreter start, app import, factory and first requests in new processes."""
+    env = dict(os.environ, ZEROHUNGER_PROFILE=profile)
+    env.setdefault('SESSION_SECRET', BENCH_SESSION_SECRET)
+    recorder.start()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=BASE_DIR, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                check=True, text=True).stdout
+        recorder.record_label('startup process', time.perf_counter() - start)
+        for label, seconds in json.loads(output.strip().splitlines()[-1]).items():
+            recorder.record_label(f'startup {label}', seconds)
+    recorder.stop()
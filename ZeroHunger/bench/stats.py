@@ -0,0 +1,115 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+
+# Reported but not gated: login latency is dominated by password hashing and
+# its sample count depends on how many distinct users the RNG picks
+UNGATED_ROUTES = {'POST auth.login'}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RouteRecorder:
+    """Collects latency samples keyed by '<METHOD> <endpoint>'."""
+
+    def __init__(self, app):
+        self.url_adapter = app.url_map.bind('localhost')
+        self.samples = defaultdict(list)
+        self.lock = threading.Lock()
+        self.started_at = None
+        self.finished_at = None
+
+    def route_label(self, method, path):
+        try:
+            endpoint, _ = self.url_adapter.match(path.split('?', 1)[0], method=method)
+        except Exception:
+            endpoint = path.split('?', 1)[0]
+        return f'{method} {endpoint}'
+
+    def record(self, method, path, seconds):
+        self.record_label(self.route_label(method, path), seconds)
+
+    def record_label(self, label, seconds):
+        with self.lock:
+            self.samples[label].append(seconds)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        self.finished_at = time.perf_counter()
+
+    def summary(self):
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        routes = {}
+        for label, samples in sorted(self.samples.items()):
+            routes[label] = {
+                'count': len(samples),
+                'p50_ms': round(percentile(samples, 50) * 1000, 3),
+                'p99_ms': round(percentile(samples, 99) * 1000, 3),
+                # Rate one client sustains on this route alone; total_rps below is wall clock
+                'rps': round(len(samples) / sum(samples), 2) if sum(samples) else 0.0,
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {'elapsed_s': round(elapsed, 3),
+                'total_rps': round(total / elapsed, 2) if elapsed else 0.0,
+                'routes': routes}
+
+
+def format_summary(summary):
+    lines = [f"{'route':<42} {'count':>7} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9}"]
+    for label, row in summary['routes'].items():
+        marker = '*' if label in UNGATED_ROUTES else ' '
+        lines.append(f"{label:<41}{marker} {row['count']:>7} {row['p50_ms']:>9.3f} "
+                     f"{row['p99_ms']:>9.3f} {row['rps']:>9.2f}")
+    lines.append(f"total: {summary['total_rps']:.2f} req/s over {summary['elapsed_s']:.2f}s")
+    if any(label in UNGATED_ROUTES for label in summary['routes']):
+        lines.append('* not checked against the baseline')
+    return '\n'.join(lines)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, baselines):
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_to_baseline(summary, baseline, tolerance=0.25, p99_tolerance=0.5, min_delta_ms=2.0):
+    """Return a list of human readable regressions (empty when within budget).
+
+    p50 may grow by ``tolerance`` and p99 by ``p99_tolerance`` (fractions),
+    each plus ``min_delta_ms`` of absolute slack so millisecond routes don't
+    fail on timer noise; throughput may drop by ``tolerance``.
+    """
+    regressions = []
+    for label, base in baseline['routes'].items():
+        if label in UNGATED_ROUTES:
+            continue
+        current = summary['routes'].get(label)
+        if current is None:
+            regressions.append(f'{label}: missing from this run')
+            continue
+        for key, allowed in (('p50_ms', tolerance), ('p99_ms', p99_tolerance)):
+            limit = base[key] * (1 + allowed) + min_delta_ms
+            if current[key] > limit:
+                regressions.append(f'{label}: {key} {current[key]:.3f} > {limit:.3f} '
+                                   f'(baseline {base[key]:.3f})')
+        floor = base['rps'] * (1 - tolerance)
+        if current['rps'] < floor:
+            regressions.append(f"{label}: rps {current['rps']:.2f} < {floor:.2f} "
+                               f"(baseline {base['rps']:.2f})")
+    return regressions
@@ -0,0 +1,16 @@
+# Seeded app for multi-worker gunicorn runs. Load it with --preload so the
+# dataset is built once in the master and shared copy-on-write by the workers:
+#   BENCH_USERS=300 BENCH_FOODS=2000 gunicorn --preload -w 4 bench.wsgi:app
+import logging
+import os
+
+from app import app
+from bench.seed import seed_data
+
+logging.getLogger().setLevel(logging.WARNING)
+
+seed_data(n_users=int(os.environ.get('BENCH_USERS', 300)),
+          n_foods=int(os.environ.get('BENCH_FOODS', 2000)),
+          n_requests=int(os.environ.get('BENCH_REQUESTS', 600)),
+          n_assignments=int(os.environ.get('BENCH_ASSIGNMENTS', 300)),
+          seed=int(os.environ.get('BENCH_SEED', 0)))
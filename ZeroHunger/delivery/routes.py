@@ -3,7 +3,26 @@ from flask_login import login_required, current_user
 from . import delivery_bp
 from models import (get_available_requests_for_delivery, assign_delivery_person, 
                    get_assignments_by_delivery_person, get_assignment_by_id, 
-                   verify_otp, get_food_by_id, requests)
+                   verify_otp, reissue_otp, get_food_by_id, requests)
+from otp_service import OTP_VERIFIED, OTP_EXPIRED, OTP_LOCKED
+
+def flash_otp_failure(result, assignment_id, otp_type):
+    if result == OTP_EXPIRED:
+        if reissue_otp(assignment_id, otp_type):
+            flash('This OTP has expired. A new code has been issued.', 'warning')
+    elif result == OTP_LOCKED and otp_type == 'pickup':
+        flash('Too many incorrect OTP attempts. The request has been released so it can be '
+              'accepted again with new codes.', 'error')
+    elif result == OTP_LOCKED:
+        flash('Too many incorrect OTP attempts. This delivery is on hold; please keep the food '
+              'and contact support to complete it.', 'error')
+    else:
+        flash('Invalid OTP. Please try again.', 'error')
+
+def refresh_expired_otp(assignment, otp_type):
+    code = assignment.pickup_otp if otp_type == 'pickup' else assignment.delivery_otp
+    if code is None and reissue_otp(assignment.id, otp_type):
+        flash('The previous OTP expired. A new code has been issued.', 'warning')
 
 @delivery_bp.route('/dashboard')
 @login_required
@@ -95,14 +114,22 @@ def verify_pickup(assignment_id):
         flash('Assignment not found.', 'error')
         return redirect(url_for('delivery.dashboard'))
     
+    if assignment.status != 'assigned':
+        flash('This pickup is no longer waiting for verification.', 'info')
+        return redirect(url_for('delivery.dashboard'))
+    
     if request.method == 'POST':
         otp_code = request.form.get('otp_code')
         
-        if verify_otp(assignment_id, otp_code, 'pickup'):
+        result = verify_otp(assignment_id, otp_code, 'pickup')
+        if result == OTP_VERIFIED:
             flash('Pickup verified successfully! You can now deliver the food.', 'success')
             return redirect(url_for('delivery.dashboard'))
-        else:
-            flash('Invalid OTP. Please try again.', 'error')
+        flash_otp_failure(result, assignment_id, 'pickup')
+        if result == OTP_LOCKED:
+            return redirect(url_for('delivery.dashboard'))
+    
+    refresh_expired_otp(assignment, 'pickup')
     
     # Get request and food details
     request_obj = requests.get(assignment.request_id)
@@ -122,6 +149,10 @@ def verify_delivery(assignment_id):
         flash('Assignment not found.', 'error')
         return redirect(url_for('delivery.dashboard'))
     
+    if assignment.status == 'needs_support':
+        flash('This delivery is on hold after too many incorrect OTPs. Please contact support.', 'error')
+        return redirect(url_for('delivery.dashboard'))
+    
     if assignment.status != 'picked_up':
         flash('You must pick up the food first before delivery.', 'error')
         return redirect(url_for('delivery.dashboard'))
@@ -129,11 +160,15 @@ def verify_delivery(assignment_id):
     if request.method == 'POST':
         otp_code = request.form.get('otp_code')
         
-        if verify_otp(assignment_id, otp_code, 'delivery'):
+        result = verify_otp(assignment_id, otp_code, 'delivery')
+        if result == OTP_VERIFIED:
             flash('Delivery completed successfully! Thank you for your service.', 'success')
             return redirect(url_for('delivery.dashboard'))
-        else:
-            flash('Invalid OTP. Please try again.', 'error')
+        flash_otp_failure(result, assignment_id, 'delivery')
+        if result == OTP_LOCKED:
+            return redirect(url_for('delivery.dashboard'))
+    
+    refresh_expired_otp(assignment, 'delivery')
     
     # Get request and food details
     request_obj = requests.get(assignment.request_id)
@@ -0,0 +1,8 @@
+import os
+
+# Picked up automatically by `gunicorn main:app` from this directory.
+# Workers are forked from a master that already built the app and compiled
+# the templates, so they serve immediately. SESSION_SECRET must be set.
+os.environ.setdefault('ZEROHUNGER_PROFILE', 'production')
+
+preload_app = True
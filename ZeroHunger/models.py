@@ -2,8 +2,7 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import uuid
-import random
-import string
+from otp_service import OTPService, OTP_VERIFIED, OTP_INVALID, OTP_LOCKED
 
 # In-memory storage for MVP
 users = {}
@@ -58,24 +57,36 @@ class DeliveryAssignment:
         self.id = str(uuid.uuid4())
         self.request_id = request_id
         self.delivery_person_id = delivery_person_id
-        self.status = 'assigned'  # assigned, picked_up, delivered
+        self.status = 'assigned'  # assigned, picked_up, delivered, released, needs_support
         self.created_at = datetime.utcnow()
-        self.pickup_otp = self.generate_otp()
-        self.delivery_otp = self.generate_otp()
         self.picked_up_at = None
         self.delivered_at = None
     
-    def generate_otp(self):
-        return ''.join(random.choices(string.digits, k=6))
+    # Codes live in the OTP service; these return None once a code is used or expired
+    @property
+    def pickup_otp(self):
+        return otp_service.active_code(self.id, 'pickup')
+    
+    @property
+    def delivery_otp(self):
+        return otp_service.active_code(self.id, 'delivery')
 
 class OTP:
-    def __init__(self, request_id, otp_type, code):
+    def __init__(self, assignment_id, request_id, otp_type, code, expires_at):
         self.id = str(uuid.uuid4())
+        self.assignment_id = assignment_id
         self.request_id = request_id
         self.otp_type = otp_type  # 'pickup' or 'delivery'
         self.code = code
         self.created_at = datetime.utcnow()
-        self.is_used = False
+        self.expires_at = expires_at  # OTP service clock, seconds since epoch
+        self.attempts = 0
+        self.is_used = False  # set once used, replaced, expired or locked
+
+otp_service = OTPService(otps, OTP)
+
+# Assignment status in which each OTP type can be verified
+OTP_STAGES = {'pickup': 'assigned', 'delivery': 'picked_up'}
 
 # Helper functions
 def get_user_by_id(user_id):
@@ -103,6 +114,15 @@ def create_food(title, description, category, expiry_hours, location, provider_i
     foods[food.id] = food
     return food
 
+def create_foods(items, provider_id):
+    # Build the whole batch first, then add it to storage in a single update
+    batch = {}
+    for item in items:
+        food = Food(provider_id=provider_id, **item)
+        batch[food.id] = food
+    foods.update(batch)
+    return list(batch.values())
+
 def get_foods_by_provider(provider_id):
     return [food for food in foods.values() if food.provider_id == provider_id]
 
@@ -144,6 +164,8 @@ def assign_delivery_person(request_id, delivery_person_id):
     if request and request.status == 'pending':
         assignment = DeliveryAssignment(request_id, delivery_person_id)
         delivery_assignments[assignment.id] = assignment
+        # The delivery OTP is issued at pickup so its expiry covers the drop-off leg
+        otp_service.issue(assignment.id, request_id, 'pickup')
         request.status = 'assigned_for_delivery'
         request.assigned_delivery_person = delivery_person_id
         return assignment
@@ -163,21 +185,65 @@ def get_available_requests_for_delivery(location=None):
     return available_requests
 
 def verify_otp(assignment_id, otp_code, otp_type):
+    """Check an OTP and advance the assignment; returns an OTP_* status from otp_service.
+
+    A lock before pickup releases the assignment, so the request goes back to
+    the pool with fresh codes. After pickup the courier already holds the food,
+    so the assignment stays with them and waits for support instead.
+    """
+    assignment = delivery_assignments.get(assignment_id)
+    if not assignment or assignment.status != OTP_STAGES.get(otp_type):
+        return OTP_INVALID
+    
+    result = otp_service.verify(assignment_id, otp_type, otp_code)
+    if result == OTP_LOCKED:
+        if otp_type == 'pickup':
+            release_assignment(assignment_id)
+        else:
+            hold_assignment(assignment_id)
+    if result != OTP_VERIFIED:
+        return result
+    
+    if otp_type == 'pickup':
+        assignment.status = 'picked_up'
+        assignment.picked_up_at = datetime.utcnow()
+        otp_service.issue(assignment_id, assignment.request_id, 'delivery')
+    else:
+        assignment.status = 'delivered'
+        assignment.delivered_at = datetime.utcnow()
+        otp_service.discard(assignment_id)
+        # Update request status
+        request = requests.get(assignment.request_id)
+        if request:
+            request.status = 'delivered'
+    return result
+
+def reissue_otp(assignment_id, otp_type):
+    # Released and held assignments are out of their OTP stage, so they get no new codes
+    assignment = delivery_assignments.get(assignment_id)
+    if (assignment and assignment.status == OTP_STAGES.get(otp_type)
+            and not otp_service.is_locked(assignment_id)):
+        return otp_service.issue(assignment_id, assignment.request_id, otp_type)
+    return None
+
+def release_assignment(assignment_id):
+    # Put the request back up for delivery and drop the assignment's codes and counters;
+    # only before pickup, while the provider still has the food
+    assignment = delivery_assignments.get(assignment_id)
+    if assignment and assignment.status == 'assigned':
+        assignment.status = 'released'
+        request = requests.get(assignment.request_id)
+        if request:
+            request.status = 'pending'
+            request.assigned_delivery_person = None
+    otp_service.discard(assignment_id)
+
+def hold_assignment(assignment_id):
+    # Keep a picked-up delivery with its courier but stop OTP checks until support steps in
     assignment = delivery_assignments.get(assignment_id)
-    if assignment:
-        if otp_type == 'pickup' and assignment.pickup_otp == otp_code:
-            assignment.status = 'picked_up'
-            assignment.picked_up_at = datetime.utcnow()
-            return True
-        elif otp_type == 'delivery' and assignment.delivery_otp == otp_code:
-            assignment.status = 'delivered'
-            assignment.delivered_at = datetime.utcnow()
-            # Update request status
-            request = requests.get(assignment.request_id)
-            if request:
-                request.status = 'delivered'
-            return True
-    return False
+    if assignment and assignment.status == 'picked_up':
+        assignment.status = 'needs_support'
+    otp_service.discard(assignment_id)
 
 def get_assignment_by_id(assignment_id):
     return delivery_assignments.get(assignment_id)
@@ -0,0 +1,195 @@
+import hmac
+import math
+import secrets
+import threading
+import time
+
+# Verification results
+OTP_VERIFIED = 'verified'
+OTP_INVALID = 'invalid'
+OTP_EXPIRED = 'expired'
+OTP_LOCKED = 'locked'
+
+OTP_TYPES = ('pickup', 'delivery')
+OTP_LENGTH = 6
+OTP_TTL_SECONDS = 12 * 60 * 60  # long enough for a pickup or drop-off leg
+MAX_ATTEMPTS = 5  # wrong codes allowed per assignment before it is locked
+
+
+def generate_code(length=OTP_LENGTH):
+    return f'{secrets.randbelow(10 ** length):0{length}d}'
+
+
+class TimerWheel:
+    """Hashed timer wheel: schedule keys by deadline, collect them once due.
+
+    Scheduling is O(1) and advancing only visits the slots for the ticks that
+    passed, so expiring codes never needs a scan over every active OTP.
+    Deadlines further out than one revolution stay in their slot until the
+    wheel has gone round enough times.
+    """
+
+    def __init__(self, now, tick_seconds=60, slots=1024):
+        self.tick_seconds = tick_seconds
+        self.slots = [[] for _ in range(slots)]
+        self.current_tick = int(now // tick_seconds)
+
+    def schedule(self, key, deadline):
+        due_tick = max(math.ceil(deadline / self.tick_seconds), self.current_tick + 1)
+        self.slots[due_tick % len(self.slots)].append((due_tick, key))
+
+    def advance(self, now):
+        target_tick = int(now // self.tick_seconds)
+        due = []
+        # One full revolution already visits every slot
+        steps = min(target_tick - self.current_tick, len(self.slots))
+        for tick in range(self.current_tick + 1, self.current_tick + steps + 1):
+            index = tick % len(self.slots)
+            bucket = self.slots[index]
+            if not bucket:
+                continue
+            pending = []
+            for due_tick, key in bucket:
+                if due_tick <= target_tick:
+                    due.append(key)
+                else:
+                    pending.append((due_tick, key))
+            self.slots[index] = pending
+        self.current_tick = max(self.current_tick, target_tick)
+        return due
+
+    def clear(self):
+        for index in range(len(self.slots)):
+            self.slots[index] = []
+
+
+class OTPService:
+    """Issues and verifies pickup/delivery OTPs for delivery assignments.
+
+    ``store`` is the ``otps`` table (OTP id -> OTP). Active codes are also
+    indexed by (assignment_id, otp_type) so verification is a dict lookup
+    plus a constant-time compare. Used, replaced and locked codes are
+    retired and deleted from the table in batches; expired ones are swept
+    by the timer wheel. All state changes happen under one lock, since the
+    threaded dev server and gthread workers call in concurrently.
+    """
+
+    def __init__(self, store, otp_class, ttl_seconds=OTP_TTL_SECONDS, max_attempts=MAX_ATTEMPTS,
+                 clock=time.time, tick_seconds=60, wheel_slots=1024, cleanup_batch=1024):
+        self.store = store
+        self.otp_class = otp_class
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.cleanup_batch = cleanup_batch
+        self.wheel = TimerWheel(clock(), tick_seconds, wheel_slots)
+        self.active = {}  # (assignment_id, otp_type) -> OTP
+        self.failed_attempts = {}  # assignment_id -> wrong codes entered
+        self.retired = []  # OTP ids waiting for bulk deletion
+        self.lock = threading.Lock()
+
+    def issue(self, assignment_id, request_id, otp_type):
+        with self.lock:
+            now = self.clock()
+            self._expire_due(now)
+            previous = self.active.get((assignment_id, otp_type))
+            if previous:
+                self._retire(previous)
+
+            otp = self.otp_class(assignment_id, request_id, otp_type, generate_code(),
+                                 now + self.ttl_seconds)
+            self.store[otp.id] = otp
+            self.active[(assignment_id, otp_type)] = otp
+            self.wheel.schedule(otp.id, otp.expires_at)
+            return otp
+
+    def active_code(self, assignment_id, otp_type):
+        otp = self.active.get((assignment_id, otp_type))
+        if otp and otp.expires_at > self.clock():
+            return otp.code
+        return None
+
+    def is_locked(self, assignment_id):
+        return self.failed_attempts.get(assignment_id, 0) >= self.max_attempts
+
+    def verify(self, assignment_id, otp_type, code):
+        with self.lock:
+            now = self.clock()
+            self._expire_due(now)
+
+            if self.is_locked(assignment_id):
+                return OTP_LOCKED
+            otp = self.active.get((assignment_id, otp_type))
+            if otp is None or otp.expires_at <= now:
+                if otp:
+                    self._retire(otp)
+                return OTP_EXPIRED
+
+            if hmac.compare_digest(otp.code.encode(), (code or '').strip().encode()):
+                otp.attempts += 1
+                self._retire(otp)
+                return OTP_VERIFIED
+
+            otp.attempts += 1
+            attempts = self.failed_attempts.get(assignment_id, 0) + 1
+            self.failed_attempts[assignment_id] = attempts
+            if attempts >= self.max_attempts:
+                self._retire_assignment(assignment_id)
+                return OTP_LOCKED
+            return OTP_INVALID
+
+    def discard(self, assignment_id):
+        with self.lock:
+            # Called once an assignment is finished so its counters don't linger
+            self._retire_assignment(assignment_id)
+            self.failed_attempts.pop(assignment_id, None)
+
+    def expire_due(self, now=None):
+        with self.lock:
+            return self._expire_due(self.clock() if now is None else now)
+
+    def flush_retired(self):
+        with self.lock:
+            self._flush_retired()
+
+    def reset(self):
+        with self.lock:
+            self.store.clear()
+            self.active.clear()
+            self.failed_attempts.clear()
+            self.retired = []
+            self.wheel.clear()
+
+    def _expire_due(self, now):
+        expired = 0
+        for otp_id in self.wheel.advance(now):
+            otp = self.store.get(otp_id)
+            # Codes already used or replaced were retired and need no work here
+            if otp and not otp.is_used and self.active.get((otp.assignment_id, otp.otp_type)) is otp:
+                self._retire(otp)
+                expired += 1
+                # Abandoned assignments shouldn't keep a counter around forever
+                if not any((otp.assignment_id, otp_type) in self.active for otp_type in OTP_TYPES):
+                    self.failed_attempts.pop(otp.assignment_id, None)
+        return expired
+
+    def _flush_retired(self):
+        retired, self.retired = self.retired, []
+        store = self.store
+        for otp_id in retired:
+            store.pop(otp_id, None)
+
+    def _retire_assignment(self, assignment_id):
+        for otp_type in OTP_TYPES:
+            otp = self.active.get((assignment_id, otp_type))
+            if otp:
+                self._retire(otp)
+
+    def _retire(self, otp):
+        otp.is_used = True
+        key = (otp.assignment_id, otp.otp_type)
+        if self.active.get(key) is otp:
+            del self.active[key]
+        self.retired.append(otp.id)
+        if len(self.retired) >= self.cleanup_batch:
+            self._flush_retired()
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+BULK_FORMATS = ('csv', 'jsonl')
+FOOD_FIELDS = ('title', 'description', 'category', 'expiry_hours', 'location')
+
+class BulkFileError(Exception):
+    """The upload as a whole can't be read, so no row can be trusted."""
+
+def detect_format(filename=None, content_type=None, requested=None):
+    """Return 'csv', 'jsonl', 'json' (a plain JSON document, not supported) or None."""
+    if requested in BULK_FORMATS:
+        return requested
+    if filename:
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if extension == 'csv':
+            return 'csv'
+        if extension in ('jsonl', 'ndjson'):
+            return 'jsonl'
+        if extension == 'json':
+            return 'json'
+    if content_type:
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'jsonl'
+        if 'json' in content_type:
+            return 'json'
+    return None
+
+def iter_rows(stream, fmt):
+    """Yield (row_number, row_dict, parse_error) lazily from a binary stream.
+
+    Rows are numbered from 1 (for CSV the header line is not counted), so
+    errors can point at the line the donor needs to fix. Raises
+    BulkFileError when the file isn't UTF-8 text or a CSV header lacks a
+    required column.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            yield from _iter_csv(text)
+        else:
+            yield from _iter_jsonl(text)
+    except UnicodeDecodeError:
+        raise BulkFileError('The file is not UTF-8 text. Please save it as UTF-8 '
+                            '(for Excel, "CSV UTF-8") and upload again.')
+
+def _iter_csv(text):
+    reader = csv.DictReader(text)
+    try:
+        header = reader.fieldnames
+    except csv.Error as e:
+        raise BulkFileError(f'Invalid CSV header: {e}')
+    if header is None:
+        return
+    missing = [name for name in FOOD_FIELDS if name not in header]
+    if missing:
+        raise BulkFileError(f'The CSV header is missing {", ".join(missing)}. '
+                            f'The first line must be: {",".join(FOOD_FIELDS)}')
+    number = 0
+    while True:
+        number += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield number, None, f'Invalid CSV: {e}'
+            continue
+        yield number, row, None
+
+def _iter_jsonl(text):
+    for number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield number, None, 'Each line must be a JSON object.'
+            continue
+        yield number, row, None
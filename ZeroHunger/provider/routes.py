@@ -1,9 +1,12 @@
+import io
 import os
-from flask import render_template, request, redirect, url_for, flash, current_app
+from flask import render_template, request, redirect, url_for, flash, current_app, jsonify
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from . import provider_bp
-from models import create_food, get_foods_by_provider, FOOD_CATEGORIES, get_requests_by_provider, get_food_by_id
+from models import (create_food, create_foods, get_foods_by_provider, FOOD_CATEGORIES,
+                   get_requests_by_provider, get_food_by_id)
+from .bulk import detect_format, iter_rows, BulkFileError, FOOD_FIELDS
 import uuid
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
@@ -12,6 +15,38 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def validate_food_fields(data):
+    """Return (fields, errors) for one food item from a form or bulk row."""
+    # JSON rows can carry lists, objects or booleans; only expiry_hours may be a number
+    type_errors = []
+    for name in FOOD_FIELDS:
+        value = data.get(name)
+        allowed = (str, int) if name == 'expiry_hours' else (str,)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, allowed)):
+            type_errors.append(f'{name} must be {"a whole number" if name == "expiry_hours" else "text"}.')
+    if type_errors:
+        return None, type_errors
+    
+    # Only missing or empty values count as blank; a JSON 0 must reach the expiry check
+    fields = {name: '' if data.get(name) is None else str(data.get(name)).strip()
+              for name in FOOD_FIELDS}
+    
+    if not all(fields.values()):
+        return None, ['Please fill in all required fields.']
+    
+    errors = []
+    try:
+        fields['expiry_hours'] = int(fields['expiry_hours'])
+        if fields['expiry_hours'] <= 0:
+            raise ValueError("Expiry hours must be positive")
+    except (ValueError, TypeError):
+        errors.append('Please enter a valid expiry time in hours.')
+    
+    if fields['category'] not in FOOD_CATEGORIES:
+        errors.append('Please select a valid category.')
+    
+    return (None, errors) if errors else (fields, [])
+
 @provider_bp.route('/dashboard')
 @login_required
 def dashboard():
@@ -37,27 +72,11 @@ def dashboard():
 @login_required
 def upload_food():
     if request.method == 'POST':
-        title = request.form.get('title')
-        description = request.form.get('description')
-        category = request.form.get('category')
-        expiry_hours = request.form.get('expiry_hours')
-        location = request.form.get('location')
+        fields, errors = validate_food_fields(request.form)
         
         # Validation
-        if not all([title, description, category, expiry_hours, location]):
-            flash('Please fill in all required fields.', 'error')
-            return render_template('provider/upload.html', categories=FOOD_CATEGORIES)
-        
-        try:
-            expiry_hours = int(expiry_hours) if expiry_hours else 0
-            if expiry_hours <= 0:
-                raise ValueError("Expiry hours must be positive")
-        except (ValueError, TypeError):
-            flash('Please enter a valid expiry time in hours.', 'error')
-            return render_template('provider/upload.html', categories=FOOD_CATEGORIES)
-        
-        if category not in FOOD_CATEGORIES:
-            flash('Please select a valid category.', 'error')
+        if errors:
+            flash(errors[0], 'error')
             return render_template('provider/upload.html', categories=FOOD_CATEGORIES)
         
         # Handle file upload
@@ -84,7 +103,7 @@ def upload_food():
                     return render_template('provider/upload.html', categories=FOOD_CATEGORIES)
         
         # Create food item
-        food = create_food(title, description, category, expiry_hours, location, current_user.id, image_filename)
+        food = create_food(provider_id=current_user.id, image_filename=image_filename, **fields)
         
         current_app.logger.info(f'Food item created: {food.title} by {current_user.username}')
         flash('Food item uploaded successfully!', 'success')
@@ -92,6 +111,78 @@ def upload_food():
     
     return render_template('provider/upload.html', categories=FOOD_CATEGORIES)
 
+@provider_bp.route('/upload/bulk', methods=['GET', 'POST'])
+@login_required
+def bulk_upload():
+    """Create many food items from a CSV or JSON lines upload.
+
+    Accepts a multipart form with a ``file`` field, or a raw request body sent
+    as ``text/csv`` / ``application/x-ndjson``. Rows are validated as they are
+    streamed; valid rows are inserted together in one batch and every invalid
+    row is reported back with its row number. With ``atomic=1`` nothing is
+    inserted when any row fails.
+    """
+    if request.method == 'GET':
+        return render_template('provider/bulk_upload.html', categories=FOOD_CATEGORIES)
+    
+    requested_format = request.values.get('format')
+    upload = request.files.get('file')
+    if upload and upload.filename:
+        fmt = detect_format(upload.filename, upload.mimetype, requested_format)
+        stream = upload.stream
+    else:
+        fmt = detect_format(content_type=request.mimetype, requested=requested_format)
+        stream = io.BufferedReader(request.stream)
+    wants_json = upload is None or request.accept_mimetypes.best == 'application/json'
+    
+    def file_error(message):
+        # Problems with the upload as a whole rather than with one row
+        if wants_json:
+            return jsonify({'created': 0, 'errors': [{'row': None, 'errors': [message]}]}), 400
+        flash(message, 'error')
+        return render_template('provider/bulk_upload.html', categories=FOOD_CATEGORIES)
+    
+    if fmt is None:
+        return file_error('Please upload a .csv or .jsonl file.')
+    if fmt == 'json':
+        return file_error('Plain JSON files are not supported. Please upload JSON lines '
+                          '(.jsonl), with one object per line.')
+    
+    valid_rows = []
+    row_errors = []
+    try:
+        for number, row, parse_error in iter_rows(stream, fmt):
+            if parse_error:
+                row_errors.append({'row': number, 'errors': [parse_error]})
+                continue
+            fields, errors = validate_food_fields(row)
+            if errors:
+                row_errors.append({'row': number, 'errors': errors})
+            else:
+                valid_rows.append(fields)
+    except BulkFileError as e:
+        return file_error(str(e))
+    
+    if not valid_rows and not row_errors:
+        return file_error('No rows found in the file.')
+    
+    atomic = request.values.get('atomic') in ('1', 'true', 'on')
+    created = []
+    if valid_rows and not (atomic and row_errors):
+        created = create_foods(valid_rows, current_user.id)
+        current_app.logger.info(f'Bulk upload created {len(created)} food items by {current_user.username}')
+    
+    if wants_json:
+        status = 200 if created or not row_errors else 400
+        return jsonify({'created': len(created), 'errors': row_errors}), status
+    
+    if created:
+        flash(f'{len(created)} food items uploaded successfully!', 'success')
+    if row_errors:
+        flash(f'{len(row_errors)} rows could not be imported.', 'error')
+    return render_template('provider/bulk_upload.html', categories=FOOD_CATEGORIES,
+                         created=len(created), row_errors=row_errors)
+
 @provider_bp.route('/food/<food_id>')
 @login_required
 def view_food(food_id):
@@ -19,7 +19,7 @@ def dashboard():
             # Find delivery assignment if any
             delivery_assignment = None
             for assignment in delivery_assignments.values():
-                if assignment.request_id == req.id:
+                if assignment.request_id == req.id and assignment.status != 'released':
                     delivery_assignment = assignment
                     break
             
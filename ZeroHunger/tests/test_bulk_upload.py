@@ -0,0 +1,171 @@
+import io
+import json
+
+import pytest
+
+import models
+from app import create_app
+from provider.bulk import detect_format, iter_rows
+
+HEADER = 'title,description,category,expiry_hours,location\n'
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    models.users.clear()
+    models.create_user('donor', 'donor@example.com', 'secret1')
+    return app
+
+
+@pytest.fixture
+def client(app):
+    models.foods.clear()
+    client = app.test_client()
+    client.post('/auth/login', data={'username': 'donor', 'password': 'secret1'})
+    return client
+
+
+def post_raw(client, body, content_type, **params):
+    query = '&'.join(f'{key}={value}' for key, value in params.items())
+    return client.post(f'/provider/upload/bulk?{query}', data=body, content_type=content_type)
+
+
+def post_file(client, body, filename, **fields):
+    data = {'file': (io.BytesIO(body), filename), **fields}
+    return client.post('/provider/upload/bulk', data=data, content_type='multipart/form-data')
+
+
+def jsonl(*rows):
+    return ''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows)
+
+
+def test_detect_format():
+    assert detect_format('items.CSV') == 'csv'
+    assert detect_format('items.ndjson') == 'jsonl'
+    assert detect_format('items.json') == 'json'
+    assert detect_format(content_type='application/x-ndjson') == 'jsonl'
+    assert detect_format(content_type='application/json') == 'json'
+    assert detect_format('items.txt', requested='csv') == 'csv'
+    assert detect_format('items.txt') is None
+
+
+def test_iter_rows_numbers_csv_rows_after_header():
+    body = (HEADER + 'Rice,Ten,Rice,4,600001\nNaan,Six,Bread,3,600002\n').encode()
+    rows = list(iter_rows(io.BytesIO(body), 'csv'))
+    assert [number for number, _, _ in rows] == [1, 2]
+    assert rows[1][1]['title'] == 'Naan'
+
+
+def test_csv_import_reports_errors_by_row(client):
+    body = HEADER + 'Rice,Ten,Rice,4,600001\nPizza,One,Pizza,0,600002\n,,,,\n'
+    response = post_raw(client, body, 'text/csv')
+
+    assert response.status_code == 200
+    assert response.json['created'] == 1
+    assert [error['row'] for error in response.json['errors']] == [2, 3]
+    assert response.json['errors'][0]['errors'] == [
+        'Please enter a valid expiry time in hours.', 'Please select a valid category.']
+    assert len(models.foods) == 1
+
+
+def test_jsonl_import_reports_errors_by_line(client):
+    body = jsonl({'title': 'Naan', 'description': 'Six', 'category': 'Bread',
+                  'expiry_hours': 3, 'location': '600001'},
+                 'not json', '[1, 2]')
+    response = post_raw(client, body, 'application/x-ndjson')
+
+    assert response.json['created'] == 1
+    assert [error['row'] for error in response.json['errors']] == [2, 3]
+    assert models.foods and list(models.foods.values())[0].expiry_hours == 3
+
+
+def test_jsonl_rejects_non_text_values(client):
+    body = jsonl({'title': ['x'], 'description': {'a': 1}, 'category': 'Rice',
+                  'expiry_hours': True, 'location': '600001'})
+    response = post_raw(client, body, 'application/x-ndjson')
+
+    assert response.status_code == 400
+    assert response.json['errors'][0]['errors'] == [
+        'title must be text.', 'description must be text.',
+        'expiry_hours must be a whole number.']
+    assert models.foods == {}
+
+
+def test_jsonl_zero_expiry_gets_the_expiry_error(client):
+    body = jsonl({'title': 'Naan', 'description': 'Six', 'category': 'Bread',
+                  'expiry_hours': 0, 'location': '600001'})
+    response = post_raw(client, body, 'application/x-ndjson')
+
+    assert response.json['errors'][0]['errors'] == ['Please enter a valid expiry time in hours.']
+
+
+def test_csv_header_with_wrong_columns_is_a_file_level_error(client):
+    body = 'Title,Description,category,expiry_hours,location\nRice,Ten,Rice,4,600001\n'
+    response = post_raw(client, body, 'text/csv')
+
+    assert response.status_code == 400
+    assert len(response.json['errors']) == 1
+    assert response.json['errors'][0]['row'] is None
+    assert 'missing title, description' in response.json['errors'][0]['errors'][0]
+    assert models.foods == {}
+
+
+def test_atomic_import_inserts_nothing_when_a_row_fails(client):
+    body = HEADER + 'Rice,Ten,Rice,4,600001\nPizza,One,Pizza,4,600002\n'
+    response = post_raw(client, body, 'text/csv', atomic=1)
+
+    assert response.json['created'] == 0
+    assert len(response.json['errors']) == 1
+    assert models.foods == {}
+
+
+def test_multipart_upload_renders_results(client):
+    body = (HEADER + 'Rice,Ten,Rice,4,600001\nPizza,One,Pizza,4,600002\n').encode()
+    response = post_file(client, body, 'items.csv')
+
+    assert response.status_code == 200
+    assert b'1 food items uploaded successfully!' in response.data
+    assert b'Rows with errors' in response.data
+    assert len(models.foods) == 1
+
+
+def test_multipart_atomic_flag(client):
+    body = (HEADER + 'Rice,Ten,Rice,4,600001\nPizza,One,Pizza,4,600002\n').encode()
+    post_file(client, body, 'items.csv', atomic='1')
+    assert models.foods == {}
+
+
+def test_non_utf8_file_is_a_file_level_error(client):
+    body = HEADER.encode() + b'A,B,Rice,4,600001\n\xff\xfe bad,x,Rice,4,600001\n'
+    response = post_raw(client, body, 'text/csv')
+
+    assert response.status_code == 400
+    assert response.json['errors'][0]['row'] is None
+    assert 'UTF-8' in response.json['errors'][0]['errors'][0]
+    assert models.foods == {}
+
+
+def test_oversized_csv_field_is_a_row_error(client):
+    body = HEADER + f'Rice,{"x" * 200_000},Rice,4,600001\nNaan,Six,Bread,3,600002\n'
+    response = post_raw(client, body, 'text/csv')
+
+    assert response.status_code == 200
+    assert response.json['errors'][0]['row'] == 1
+    assert response.json['errors'][0]['errors'][0].startswith('Invalid CSV')
+
+
+def test_plain_json_is_rejected_with_a_clear_message(client):
+    response = post_raw(client, json.dumps([{'title': 'Rice'}]), 'application/json')
+
+    assert response.status_code == 400
+    assert 'JSON lines' in response.json['errors'][0]['errors'][0]
+
+
+@pytest.mark.parametrize('body', ['', HEADER])
+def test_empty_file_reports_no_rows(client, body):
+    response = post_raw(client, body, 'text/csv')
+
+    assert response.status_code == 400
+    assert response.json['errors'][0]['errors'] == ['No rows found in the file.']
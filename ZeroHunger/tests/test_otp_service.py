@@ -0,0 +1,205 @@
+import threading
+
+import pytest
+
+import models
+from models import (OTP, create_user, create_food, request_food, assign_delivery_person,
+                    verify_otp, reissue_otp, requests, foods)
+from otp_service import (OTPService, TimerWheel, MAX_ATTEMPTS, OTP_VERIFIED, OTP_INVALID,
+                         OTP_EXPIRED, OTP_LOCKED)
+
+START = 1_700_000_040.0
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def service(clock):
+    return OTPService({}, OTP, clock=clock, tick_seconds=60, wheel_slots=8)
+
+
+def test_wheel_holds_deadlines_more_than_one_revolution_out():
+    wheel = TimerWheel(0, tick_seconds=1, slots=8)
+    wheel.schedule('far', 20)
+    wheel.schedule('near', 3)
+
+    assert wheel.advance(8) == ['near']
+    assert wheel.advance(19) == []
+    assert wheel.advance(20) == ['far']
+
+
+def test_wheel_catches_up_after_long_gap():
+    wheel = TimerWheel(0, tick_seconds=1, slots=8)
+    for deadline in (2, 9, 30):
+        wheel.schedule(deadline, deadline)
+
+    assert sorted(wheel.advance(100)) == [2, 9, 30]
+
+
+def test_code_valid_until_ttl_and_expired_at_boundary(service, clock):
+    otp = service.issue('a1', 'r1', 'pickup')
+
+    clock.now = START + service.ttl_seconds - 0.001
+    assert service.active_code('a1', 'pickup') == otp.code
+
+    clock.now = START + service.ttl_seconds
+    assert service.active_code('a1', 'pickup') is None
+    assert service.verify('a1', 'pickup', otp.code) == OTP_EXPIRED
+
+
+def test_wheel_sweeps_expired_codes(service, clock):
+    service.issue('a1', 'r1', 'pickup')
+    clock.now = START + service.ttl_seconds + 60
+
+    assert service.expire_due() == 1
+    service.flush_retired()
+    assert service.store == {}
+    assert service.active == {}
+
+
+def test_reissue_replaces_previous_code(service):
+    first = service.issue('a1', 'r1', 'pickup')
+    second = service.issue('a1', 'r1', 'pickup')
+
+    assert first.is_used
+    assert service.active_code('a1', 'pickup') == second.code
+    if first.code != second.code:
+        assert service.verify('a1', 'pickup', first.code) == OTP_INVALID
+    assert service.verify('a1', 'pickup', second.code) == OTP_VERIFIED
+
+
+def test_code_cannot_be_used_twice(service):
+    otp = service.issue('a1', 'r1', 'pickup')
+
+    assert service.verify('a1', 'pickup', otp.code) == OTP_VERIFIED
+    assert service.verify('a1', 'pickup', otp.code) == OTP_EXPIRED
+
+
+def test_lock_counts_attempts_across_both_types(service):
+    pickup = service.issue('a1', 'r1', 'pickup')
+    service.issue('a1', 'r1', 'delivery')
+
+    results = [service.verify('a1', 'pickup', 'wrong') for _ in range(MAX_ATTEMPTS - 2)]
+    results += [service.verify('a1', 'delivery', 'wrong') for _ in range(2)]
+
+    assert results[:-1] == [OTP_INVALID] * (MAX_ATTEMPTS - 1)
+    assert results[-1] == OTP_LOCKED
+    assert service.is_locked('a1')
+    assert service.verify('a1', 'pickup', pickup.code) == OTP_LOCKED
+    assert service.active == {}
+
+
+def test_discard_clears_codes_and_counters(service):
+    service.issue('a1', 'r1', 'pickup')
+    service.verify('a1', 'pickup', 'wrong')
+
+    service.discard('a1')
+
+    assert service.active_code('a1', 'pickup') is None
+    assert 'a1' not in service.failed_attempts
+
+
+def test_expiry_drops_counters_of_abandoned_assignments(service, clock):
+    service.issue('a1', 'r1', 'pickup')
+    service.verify('a1', 'pickup', 'wrong')
+
+    clock.now = START + service.ttl_seconds + 60
+    service.expire_due()
+
+    assert service.failed_attempts == {}
+
+
+def test_batch_flush_keeps_table_bounded(clock):
+    service = OTPService({}, OTP, clock=clock, cleanup_batch=10)
+    for i in range(100):
+        otp = service.issue(f'a{i}', f'r{i}', 'pickup')
+        assert service.verify(f'a{i}', 'pickup', otp.code) == OTP_VERIFIED
+        assert len(service.store) <= 10
+
+    service.flush_retired()
+    assert service.store == {}
+
+
+def test_concurrent_verifies_accept_a_code_once(service):
+    otp = service.issue('a1', 'r1', 'pickup')
+    barrier = threading.Barrier(8)
+    results = []
+
+    def attempt():
+        barrier.wait()
+        results.append(service.verify('a1', 'pickup', otp.code))
+
+    threads = [threading.Thread(target=attempt) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(OTP_VERIFIED) == 1
+
+
+@pytest.fixture
+def assignment():
+    models.users.clear()
+    models.foods.clear()
+    models.requests.clear()
+    models.delivery_assignments.clear()
+    models.otp_service.reset()
+    provider = create_user('provider', 'provider@example.com', 'secret1')
+    receiver = create_user('receiver', 'receiver@example.com', 'secret1')
+    courier = create_user('courier', 'courier@example.com', 'secret1')
+    food = create_food('Rice', 'Ten servings', 'Rice', 4, '600001', provider.id)
+    food_request = request_food(food.id, receiver.id)
+    return assign_delivery_person(food_request.id, courier.id)
+
+
+def test_full_delivery_discards_codes(assignment):
+    assert verify_otp(assignment.id, assignment.pickup_otp, 'pickup') == OTP_VERIFIED
+    assert assignment.status == 'picked_up'
+    assert verify_otp(assignment.id, assignment.delivery_otp, 'delivery') == OTP_VERIFIED
+    assert assignment.status == 'delivered'
+    assert requests[assignment.request_id].status == 'delivered'
+    assert assignment.id not in models.otp_service.failed_attempts
+
+
+def test_lock_releases_request_for_reassignment(assignment):
+    results = [verify_otp(assignment.id, 'wrong', 'pickup') for _ in range(MAX_ATTEMPTS)]
+
+    assert results[-1] == OTP_LOCKED
+    assert assignment.status == 'released'
+    food_request = requests[assignment.request_id]
+    assert food_request.status == 'pending'
+    assert food_request.assigned_delivery_person is None
+    assert assignment.id not in models.otp_service.failed_attempts
+
+    again = assign_delivery_person(food_request.id, assignment.delivery_person_id)
+    assert again is not None
+    assert verify_otp(again.id, again.pickup_otp, 'pickup') == OTP_VERIFIED
+
+
+def test_lock_after_pickup_keeps_delivery_with_courier(assignment):
+    assert verify_otp(assignment.id, assignment.pickup_otp, 'pickup') == OTP_VERIFIED
+    results = [verify_otp(assignment.id, 'wrong', 'delivery') for _ in range(MAX_ATTEMPTS)]
+
+    assert results[-1] == OTP_LOCKED
+    assert assignment.status == 'needs_support'
+    food_request = requests[assignment.request_id]
+    assert food_request.status == 'assigned_for_delivery'
+    assert food_request.assigned_delivery_person == assignment.delivery_person_id
+    assert foods[food_request.food_id].status == 'booked'
+
+    assert assign_delivery_person(food_request.id, 'another-courier') is None
+    assert reissue_otp(assignment.id, 'delivery') is None
+    assert assignment.delivery_otp is None
+    assert verify_otp(assignment.id, 'wrong', 'delivery') == OTP_INVALID